@@ -0,0 +1,454 @@
+# cython: language_level=3
+"""Cython bindings to the chitin C ABI (chitin.h). Preferred over _ffi when compiled."""
+
+import ctypes
+
+from cpython.pycapsule cimport PyCapsule_New, PyCapsule_SetContext
+from cpython.unicode cimport PyUnicode_AsUTF8String
+from libc.stdint cimport int32_t, uint64_t, uintptr_t
+from libc.stdlib cimport calloc, free, malloc
+
+from chitin._ffi import (
+    IS_TRACED_SIGNATURE,
+    _OUTCOME_DENY,
+    _OUTCOME_ESCALATE,
+    _make_allow,
+    _tool_config,
+)
+from chitin._json import dumps, loads
+from chitin._types import ChitinError, Decision, ExplainResult
+
+# Status codes from chitin.h
+cdef enum:
+    CHITIN_OK = 0
+    CHITIN_ERR_INVALID = -1
+    CHITIN_ERR_DENIED = -2
+    CHITIN_ERR_ESCALATED = -3
+    CHITIN_ERR_INTERNAL = -4
+    CHITIN_ERR_NOT_FOUND = -5
+
+# Prototypes from chitin.h. The symbols are resolved from the same library
+# _resolve.py picks (loaded via ctypes), so no link-time dependency on libchitin.
+# Engine calls run with the GIL released so threads can propose in parallel.
+ctypedef void* chitin_engine_t
+ctypedef int32_t chitin_status_t
+
+ctypedef chitin_engine_t (*engine_new_fn)(const char*, size_t) noexcept nogil
+ctypedef void (*engine_free_fn)(chitin_engine_t) noexcept nogil
+ctypedef chitin_status_t (*ingest_fn)(
+    chitin_engine_t, const char*, size_t, int32_t, const char*, size_t, uint64_t*
+) noexcept nogil
+ctypedef chitin_status_t (*propose_fn)(
+    chitin_engine_t, const char*, size_t, const char*, size_t, const char*, size_t,
+    const uint64_t*, size_t, uint64_t*
+) noexcept nogil
+ctypedef chitin_status_t (*record_result_fn)(
+    chitin_engine_t, uint64_t, const char*, size_t, int32_t, uint64_t*
+) noexcept nogil
+ctypedef chitin_status_t (*is_traced_fn)(
+    chitin_engine_t, uint64_t, const char*, size_t, int32_t*
+) noexcept nogil
+ctypedef chitin_status_t (*set_label_fn)(chitin_engine_t, uint64_t, const char*, size_t) noexcept nogil
+ctypedef chitin_status_t (*explain_fn)(chitin_engine_t, uint64_t, char**, size_t*) noexcept nogil
+ctypedef chitin_status_t (*last_error_fn)(char**, size_t*) noexcept nogil
+ctypedef void (*free_string_fn)(char*, size_t) noexcept nogil
+ctypedef chitin_status_t (*register_tool_fn)(
+    chitin_engine_t, const char*, size_t, const char*, size_t
+) noexcept nogil
+ctypedef chitin_status_t (*load_policies_yaml_fn)(chitin_engine_t, const char*, size_t) noexcept nogil
+ctypedef chitin_status_t (*propose_ex_fn)(
+    chitin_engine_t, const char*, size_t, const char*, size_t, const char*, size_t,
+    const uint64_t*, size_t, uint64_t*, char**, size_t*, char**, size_t*
+) noexcept nogil
+ctypedef chitin_status_t (*ingest_batch_fn)(
+    chitin_engine_t, const char*, const size_t*, size_t, const int32_t*, const char*, size_t,
+    uint64_t*
+) noexcept nogil
+
+# Stack space for input_sources; larger lists are heap-allocated.
+cdef enum:
+    _SMALL_SOURCES = 16
+
+
+# Kept alive for the module's lifetime; capsules only borrow its buffer.
+cdef bytes _IS_TRACED_SIGNATURE_BYTES = IS_TRACED_SIGNATURE
+cdef const char* _IS_TRACED_SIGNATURE = _IS_TRACED_SIGNATURE_BYTES
+
+
+cdef uintptr_t _addr(object lib, str name) except 0:
+    return ctypes.cast(getattr(lib, name), ctypes.c_void_p).value
+
+
+cdef uintptr_t _optional_addr(object lib, str name):
+    # Entry points only newer engines export; NULL when absent.
+    fn = getattr(lib, name, None)
+    if fn is None:
+        return 0
+    return ctypes.cast(fn, ctypes.c_void_p).value
+
+
+cdef inline bytes _as_bytes(object s):
+    # Pre-encoded payloads are passed through without a second encode.
+    if type(s) is bytes:
+        return <bytes>s
+    return PyUnicode_AsUTF8String(s)
+
+
+cdef class CyEngine:
+    """Opaque engine handle returned by CyFFI.engine_new."""
+
+    cdef chitin_engine_t handle
+
+
+cdef inline chitin_engine_t _handle(CyEngine engine) except NULL:
+    if engine is None or engine.handle == NULL:
+        raise ChitinError(CHITIN_ERR_INVALID, "Engine is closed")
+    return engine.handle
+
+
+cdef class CyFFI:
+    """Same interface as _ffi._ChitinFFI, calling the C ABI without ctypes marshalling."""
+
+    cdef object _lib
+    cdef engine_new_fn _engine_new
+    cdef engine_free_fn _engine_free
+    cdef ingest_fn _ingest
+    cdef propose_fn _propose
+    cdef record_result_fn _record_result
+    cdef is_traced_fn _is_traced
+    cdef set_label_fn _set_label
+    cdef explain_fn _explain
+    cdef last_error_fn _last_error_fn
+    cdef free_string_fn _free_string
+    cdef register_tool_fn _register_tool
+    cdef load_policies_yaml_fn _load_policies_yaml
+    cdef ingest_batch_fn _ingest_batch
+    cdef propose_ex_fn _propose_ex
+
+    def __cinit__(self, lib):
+        # Keep the CDLL alive for as long as we hold its function pointers.
+        self._lib = lib
+        self._engine_new = <engine_new_fn>_addr(lib, "chitin_engine_new")
+        self._engine_free = <engine_free_fn>_addr(lib, "chitin_engine_free")
+        self._ingest = <ingest_fn>_addr(lib, "chitin_ingest")
+        self._propose = <propose_fn>_addr(lib, "chitin_propose")
+        self._record_result = <record_result_fn>_addr(lib, "chitin_record_result")
+        self._is_traced = <is_traced_fn>_addr(lib, "chitin_is_traced")
+        self._set_label = <set_label_fn>_addr(lib, "chitin_set_label")
+        self._explain = <explain_fn>_addr(lib, "chitin_explain")
+        self._last_error_fn = <last_error_fn>_addr(lib, "chitin_last_error")
+        self._free_string = <free_string_fn>_addr(lib, "chitin_free_string")
+        self._register_tool = <register_tool_fn>_addr(lib, "chitin_register_tool")
+        self._load_policies_yaml = <load_policies_yaml_fn>_addr(lib, "chitin_load_policies_yaml")
+        self._ingest_batch = <ingest_batch_fn>_optional_addr(lib, "chitin_ingest_batch")
+        self._propose_ex = <propose_ex_fn>_optional_addr(lib, "chitin_propose_ex")
+
+    cdef str _last_error(self):
+        cdef char* out_ptr = NULL
+        cdef size_t out_len = 0
+        cdef chitin_status_t st = self._last_error_fn(&out_ptr, &out_len)
+        if st == CHITIN_ERR_NOT_FOUND or out_ptr == NULL:
+            return "unknown error"
+        try:
+            return out_ptr[:out_len].decode("utf-8")
+        finally:
+            self._free_string(out_ptr, out_len)
+
+    cdef object _take_string(self, char* ptr, size_t length):
+        # Decode and free a string the engine returned through an out-param.
+        if ptr == NULL:
+            return None
+        try:
+            return ptr[:length].decode("utf-8")
+        finally:
+            self._free_string(ptr, length)
+
+    cpdef CyEngine engine_new(self, str config_path):
+        cdef bytes b
+        cdef const char* p = NULL
+        cdef Py_ssize_t n = 0
+        if config_path is not None:
+            b = config_path.encode("utf-8")
+            p = b
+            n = len(b)
+        cdef chitin_engine_t handle
+        with nogil:
+            handle = self._engine_new(p, n)
+        if handle == NULL:
+            raise ChitinError(CHITIN_ERR_INTERNAL, self._last_error())
+        cdef CyEngine engine = CyEngine.__new__(CyEngine)
+        engine.handle = handle
+        return engine
+
+    cpdef engine_free(self, CyEngine engine):
+        if engine is not None and engine.handle != NULL:
+            self._engine_free(engine.handle)
+            engine.handle = NULL
+
+    cpdef ingest(self, CyEngine engine, object content, int32_t trust_level, object metadata=None):
+        cdef bytes b = _as_bytes(content)
+        cdef const char* p = b
+        cdef Py_ssize_t n = len(b)
+        cdef bytes mb
+        cdef const char* mp = NULL
+        cdef Py_ssize_t mn = 0
+        if metadata is not None:
+            mb = dumps(metadata)
+            mp = mb
+            mn = len(mb)
+        cdef uint64_t out_id = 0
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._ingest(handle, p, n, trust_level, mp, mn, &out_id)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+        return out_id
+
+    cpdef list ingest_batch(self, CyEngine engine, list events):
+        if self._ingest_batch == NULL:
+            return [self.ingest(engine, c, t, m) for c, t, m in events]
+        cdef Py_ssize_t i, count = len(events)
+        if count == 0:
+            return []
+        cdef chitin_engine_t handle = _handle(engine)
+        chunks = []
+        metas = []
+        cdef bint has_meta = False
+        cdef size_t pos = 0
+        cdef bytes b
+        cdef size_t* offsets = <size_t*>malloc((count + 1) * sizeof(size_t))
+        cdef int32_t* trust_levels = <int32_t*>malloc(count * sizeof(int32_t))
+        cdef uint64_t* out_ids = <uint64_t*>calloc(count, sizeof(uint64_t))
+        cdef bytes contents, mb
+        cdef const char* cp
+        cdef const char* mp = NULL
+        cdef Py_ssize_t mn = 0
+        cdef chitin_status_t st
+        try:
+            if offsets == NULL or trust_levels == NULL or out_ids == NULL:
+                raise MemoryError()
+            for i in range(count):
+                content, trust_level, metadata = events[i]
+                b = _as_bytes(content)
+                chunks.append(b)
+                offsets[i] = pos
+                pos += len(b)
+                trust_levels[i] = trust_level
+                metas.append(metadata)
+                if metadata is not None:
+                    has_meta = True
+            offsets[count] = pos
+            contents = b"".join(chunks)
+            if has_meta:
+                mb = dumps(metas)
+                mp = mb
+                mn = len(mb)
+            cp = contents
+            with nogil:
+                st = self._ingest_batch(
+                    handle, cp, offsets, count, trust_levels, mp, mn, out_ids
+                )
+            if st != CHITIN_OK:
+                raise ChitinError(st, self._last_error())
+            return [out_ids[i] for i in range(count)]
+        finally:
+            free(offsets)
+            free(trust_levels)
+            free(out_ids)
+
+    cpdef propose(
+        self,
+        CyEngine engine,
+        str tool,
+        object params,
+        str agent_id=None,
+        object input_sources=None,
+    ):
+        cdef bytes tb = tool.encode("utf-8")
+        cdef const char* tp = tb
+        cdef Py_ssize_t tn = len(tb)
+        cdef bytes pb = _as_bytes(params)
+        cdef const char* pp = pb
+        cdef Py_ssize_t pn = len(pb)
+        cdef bytes ab
+        cdef const char* ap = NULL
+        cdef Py_ssize_t an = 0
+        if agent_id is not None:
+            ab = agent_id.encode("utf-8")
+            ap = ab
+            an = len(ab)
+
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef uint64_t small[_SMALL_SOURCES]
+        cdef uint64_t* sources = NULL
+        cdef Py_ssize_t i, sn = 0
+        if input_sources:
+            sn = len(input_sources)
+            if sn <= _SMALL_SOURCES:
+                sources = small
+            else:
+                sources = <uint64_t*>malloc(sn * sizeof(uint64_t))
+                if sources == NULL:
+                    raise MemoryError()
+
+        cdef uint64_t out_id = 0
+        cdef char* rule_ptr = NULL
+        cdef size_t rule_len = 0
+        cdef char* reason_ptr = NULL
+        cdef size_t reason_len = 0
+        cdef chitin_status_t st
+        try:
+            for i in range(sn):
+                sources[i] = input_sources[i]
+            with nogil:
+                if self._propose_ex != NULL:
+                    st = self._propose_ex(
+                        handle, tp, tn, pp, pn, ap, an, sources, sn, &out_id,
+                        &rule_ptr, &rule_len, &reason_ptr, &reason_len,
+                    )
+                else:
+                    st = self._propose(
+                        handle, tp, tn, pp, pn, ap, an, sources, sn, &out_id
+                    )
+        finally:
+            if sources != NULL and sources != small:
+                free(sources)
+
+        if st == CHITIN_OK:
+            return _make_allow(out_id)
+        if st == CHITIN_ERR_DENIED or st == CHITIN_ERR_ESCALATED:
+            if self._propose_ex != NULL:
+                rule_id = self._take_string(rule_ptr, rule_len)
+                reason = self._take_string(reason_ptr, reason_len) or ""
+            else:
+                # Older engines only report the firing rule via the last-error JSON.
+                err_json = self._last_error()
+                try:
+                    obj = loads(err_json)
+                    rule_id = obj.get("rule_id")
+                    reason = obj.get("reason", "")
+                except Exception:
+                    rule_id = None
+                    reason = err_json
+            outcome = _OUTCOME_DENY if st == CHITIN_ERR_DENIED else _OUTCOME_ESCALATE
+            return Decision(False, outcome, out_id, rule_id, reason)
+        raise ChitinError(st, self._last_error())
+
+    cpdef record_result(self, CyEngine engine, uint64_t tool_call_id, str output, int32_t exit_code=0):
+        cdef bytes b = output.encode("utf-8")
+        cdef const char* p = b
+        cdef Py_ssize_t n = len(b)
+        cdef uint64_t out_id = 0
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._record_result(handle, tool_call_id, p, n, exit_code, &out_id)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+        return out_id
+
+    cpdef bint is_traced(self, CyEngine engine, uint64_t event_id, str label) except *:
+        cdef bytes b = label.encode("utf-8")
+        cdef const char* p = b
+        cdef Py_ssize_t n = len(b)
+        cdef int32_t out_result = 0
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._is_traced(handle, event_id, p, n, &out_result)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+        return out_result != 0
+
+    cpdef list is_traced_many(self, CyEngine engine, object event_ids, str label):
+        cdef bytes b = label.encode("utf-8")
+        cdef const char* p = b
+        cdef Py_ssize_t n = len(b)
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef Py_ssize_t i, count = len(event_ids)
+        if count == 0:
+            return []
+        cdef uint64_t* ids = <uint64_t*>malloc(count * sizeof(uint64_t))
+        cdef int32_t* results = <int32_t*>calloc(count, sizeof(int32_t))
+        cdef chitin_status_t st = CHITIN_OK
+        try:
+            if ids == NULL or results == NULL:
+                raise MemoryError()
+            for i in range(count):
+                ids[i] = event_ids[i]
+            # One Python->C transition for the whole batch.
+            with nogil:
+                for i in range(count):
+                    st = self._is_traced(handle, ids[i], p, n, &results[i])
+                    if st != CHITIN_OK:
+                        break
+            if st != CHITIN_OK:
+                raise ChitinError(st, self._last_error())
+            return [results[i] != 0 for i in range(count)]
+        finally:
+            free(ids)
+            free(results)
+
+    cpdef object is_traced_raw_capsule(self, CyEngine engine):
+        cdef chitin_engine_t handle = _handle(engine)
+        capsule = PyCapsule_New(<void*>self._is_traced, _IS_TRACED_SIGNATURE, NULL)
+        PyCapsule_SetContext(capsule, handle)
+        return capsule
+
+    cpdef set_label(self, CyEngine engine, uint64_t event_id, str label):
+        cdef bytes b = label.encode("utf-8")
+        cdef const char* p = b
+        cdef Py_ssize_t n = len(b)
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._set_label(handle, event_id, p, n)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+
+    cpdef explain(self, CyEngine engine, uint64_t event_id):
+        cdef char* out_ptr = NULL
+        cdef size_t out_len = 0
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._explain(handle, event_id, &out_ptr, &out_len)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+        if out_ptr == NULL or out_len == 0:
+            return ExplainResult("", [])
+        try:
+            text = out_ptr[:out_len].decode("utf-8")
+        finally:
+            self._free_string(out_ptr, out_len)
+        try:
+            obj = loads(text)
+            return ExplainResult(obj.get("text", ""), obj.get("trace_chain", []))
+        except Exception:
+            return ExplainResult(text, [])
+
+    cpdef load_policies_yaml(self, CyEngine engine, str yaml_str):
+        cdef bytes b = yaml_str.encode("utf-8")
+        cdef const char* p = b
+        cdef Py_ssize_t n = len(b)
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._load_policies_yaml(handle, p, n)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+
+    cpdef register_tool(self, CyEngine engine, str name, str risk="medium", str category=None):
+        cdef bytes cb = _tool_config(risk, category)
+        cdef const char* cp = cb
+        cdef Py_ssize_t cn = len(cb)
+        cdef bytes nb = name.encode("utf-8")
+        cdef const char* np = nb
+        cdef Py_ssize_t nn = len(nb)
+        cdef chitin_engine_t handle = _handle(engine)
+        cdef chitin_status_t st
+        with nogil:
+            st = self._register_tool(handle, np, nn, cp, cn)
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
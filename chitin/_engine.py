@@ -1,10 +1,31 @@
 """Engine class: dispatches to FFI or HTTP backend."""
 
+import functools
 import os
 from typing import Any
 
 from chitin._types import ChitinError, Decision, ExplainResult
 
+# Backend methods bound once per engine as private attributes (_ingest, ...),
+# so the public methods forward without checking which backend is in use.
+_BOUND_METHODS = (
+    "ingest",
+    "ingest_batch",
+    "propose",
+    "record_result",
+    "is_traced",
+    "is_traced_many",
+    "is_traced_raw_capsule",
+    "set_label",
+    "explain",
+    "load_policies_yaml",
+    "register_tool",
+)
+
+
+def _closed(*args: Any, **kwargs: Any) -> Any:
+    raise ChitinError(-1, "Engine is closed")
+
 
 class Engine:
     """
@@ -18,6 +39,7 @@ class Engine:
         self._ffi: Any = None
         self._handle: Any = None
         self._http: Any = None
+        self._unbind()
 
         # 1. Try FFI
         try:
@@ -27,6 +49,7 @@ class Engine:
             self._ffi = ffi
             self._handle = handle
             self._backend = "ffi"
+            self._bind(ffi, handle)
             return
         except (ChitinError, OSError):
             pass
@@ -37,6 +60,7 @@ class Engine:
             from chitin import _http
             self._http = _http._ChitinHTTP(url)
             self._backend = "http"
+            self._bind(self._http)
             return
 
         raise ChitinError(
@@ -44,36 +68,40 @@ class Engine:
             "Chitin engine unavailable: native library failed to load and CHITIN_SIDECAR_URL is not set.",
         )
 
-    def _ensure_open(self) -> None:
-        if self._backend == "none":
-            raise ChitinError(-1, "Engine is closed")
+    def _bind(self, impl: Any, *args: Any) -> None:
+        for name in _BOUND_METHODS:
+            method = getattr(impl, name)
+            setattr(self, "_" + name, functools.partial(method, *args) if args else method)
+
+    def _unbind(self) -> None:
+        for name in _BOUND_METHODS:
+            setattr(self, "_" + name, _closed)
 
     def ingest(
         self,
-        content: str,
+        content: str | bytes,
         trust_level: int,
         metadata: dict | None = None,
     ) -> int:
-        """Record a message. Returns event_id."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            return self._ffi.ingest(self._handle, content, trust_level, metadata)
-        return self._http.ingest(content, trust_level, metadata)
+        """Record a message (str, or UTF-8 bytes passed through as-is). Returns event_id."""
+        return self._ingest(content, trust_level, metadata)
+
+    def ingest_batch(
+        self,
+        events: list[tuple[str | bytes, int, dict | None]],
+    ) -> list[int]:
+        """Record (content, trust_level, metadata) events in one call. Returns event_ids in order."""
+        return self._ingest_batch(events)
 
     def propose(
         self,
         tool: str,
-        params: str,
+        params: str | bytes,
         agent_id: str | None = None,
         input_sources: list[int] | None = None,
     ) -> Decision:
-        """Propose a tool call. Returns Decision (never raises for deny/escalate)."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            return self._ffi.propose(
-                self._handle, tool, params, agent_id, input_sources
-            )
-        return self._http.propose(tool, params, agent_id, input_sources)
+        """Propose a tool call; params may be pre-encoded UTF-8 JSON bytes. Returns Decision (never raises for deny/escalate)."""
+        return self._propose(tool, params, agent_id, input_sources)
 
     def record_result(
         self,
@@ -82,42 +110,37 @@ class Engine:
         exit_code: int = 0,
     ) -> int:
         """Record tool result. Returns event_id."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            return self._ffi.record_result(
-                self._handle, tool_call_id, output, exit_code
-            )
-        return self._http.record_result(tool_call_id, output, exit_code)
+        return self._record_result(tool_call_id, output, exit_code)
 
     def is_traced(self, event_id: int, label: str) -> bool:
         """Check if event traces to a label."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            return self._ffi.is_traced(self._handle, event_id, label)
-        return self._http.is_traced(event_id, label)
+        return self._is_traced(event_id, label)
+
+    def is_traced_many(self, event_ids: list[int], label: str) -> list[bool]:
+        """Check many events against one label in a single backend call."""
+        return self._is_traced_many(event_ids, label)
+
+    def is_traced_raw_capsule(self) -> Any:
+        """
+        Export chitin_is_traced as a PyCapsule for C/Cython/Numba integrators
+        (scipy.LowLevelCallable style). The capsule name is the C signature,
+        "int32_t (void *, uint64_t, const char *, size_t, int32_t *)"; its
+        context (PyCapsule_GetContext) is this engine's handle, pass it as the
+        first argument. Valid until close(). FFI backend only.
+        """
+        return self._is_traced_raw_capsule()
 
     def set_label(self, event_id: int, label: str) -> None:
         """Set a trace label on an event and propagate downstream."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            self._ffi.set_label(self._handle, event_id, label)
-        else:
-            self._http.set_label(event_id, label)
+        self._set_label(event_id, label)
 
     def explain(self, event_id: int) -> ExplainResult:
         """Get trace chain and explanation for an event."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            return self._ffi.explain(self._handle, event_id)
-        return self._http.explain(event_id)
+        return self._explain(event_id)
 
     def load_policies_yaml(self, yaml_str: str) -> None:
         """Load additional policies from a YAML string. Appends to existing policies."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            self._ffi.load_policies_yaml(self._handle, yaml_str)
-        else:
-            self._http.load_policies_yaml(yaml_str)
+        self._load_policies_yaml(yaml_str)
 
     def register_tool(
         self,
@@ -126,17 +149,16 @@ class Engine:
         category: str | None = None,
     ) -> None:
         """Register a tool with risk level and optional category."""
-        self._ensure_open()
-        if self._backend == "ffi":
-            self._ffi.register_tool(self._handle, name, risk, category)
-        else:
-            self._http.register_tool(name, risk, category)
+        self._register_tool(name, risk, category)
 
     def close(self) -> None:
         """Destroy engine. Do not use after calling this."""
         if self._backend == "ffi" and self._handle is not None:
             self._ffi.engine_free(self._handle)
             self._handle = None
+        if self._http is not None:
+            self._http.close()
+        self._unbind()
         self._backend = "none"
         self._ffi = None
         self._http = None
@@ -1,8 +1,15 @@
 """ctypes bindings to the chitin C ABI (chitin.h)."""
 
+import array
 import ctypes
+import functools
+import json
+import sys
+import threading
 from ctypes import POINTER, c_char_p, c_int32, c_uint64, c_void_p, c_size_t
+from typing import Any
 
+from chitin._json import dumps, loads
 from chitin._resolve import resolve_chitin_lib, _load_lib_error_message
 from chitin._types import ChitinError, Decision, ExplainResult
 
@@ -14,42 +21,49 @@ CHITIN_ERR_ESCALATED = -3
 CHITIN_ERR_INTERNAL = -4
 CHITIN_ERR_NOT_FOUND = -5
 
-
-def _to_buf(s: str | None) -> tuple[bytes | None, int]:
-    if s is None:
-        return None, 0
-    b = s.encode("utf-8")
-    return b, len(b)
-
-
-def _load_lib() -> ctypes.CDLL:
-    path = resolve_chitin_lib()
-    try:
-        return ctypes.CDLL(path)
-    except OSError as e:
-        raise OSError(_load_lib_error_message()) from e
-
-
-class _ChitinFFI:
-    """Holds the loaded library and wraps C ABI calls."""
-
-    def __init__(self) -> None:
-        self._lib = _load_lib()
-        self._setup_signatures()
-
-    def _setup_signatures(self) -> None:
-        lib = self._lib
-
-        # chitin_engine_t chitin_engine_new(const char* config_path, size_t config_path_len);
-        lib.chitin_engine_new.argtypes = [c_char_p, c_size_t]
-        lib.chitin_engine_new.restype = c_void_p
-
-        # void chitin_engine_free(chitin_engine_t engine);
-        lib.chitin_engine_free.argtypes = [c_void_p]
-        lib.chitin_engine_free.restype = None
-
-        # chitin_status_t chitin_ingest(...);
-        lib.chitin_ingest.argtypes = [
+# Capsule name for the exported chitin_is_traced pointer (scipy LowLevelCallable
+# convention: the name is the C signature). Module-level so it outlives capsules.
+IS_TRACED_SIGNATURE = b"int32_t (void *, uint64_t, const char *, size_t, int32_t *)"
+
+# Private prototypes for building that capsule from the ctypes wrapper; setting
+# argtypes on ctypes.pythonapi's shared attributes would leak to other callers.
+if hasattr(ctypes, "pythonapi"):
+    _capsule_new = ctypes.PYFUNCTYPE(ctypes.py_object, c_void_p, c_char_p, c_void_p)(
+        ("PyCapsule_New", ctypes.pythonapi)
+    )
+    _capsule_set_context = ctypes.PYFUNCTYPE(ctypes.c_int, ctypes.py_object, c_void_p)(
+        ("PyCapsule_SetContext", ctypes.pythonapi)
+    )
+else:  # PyPy
+    _capsule_new = _capsule_set_context = None
+
+_OUTCOME_ALLOW = sys.intern("allow")
+_OUTCOME_DENY = sys.intern("deny")
+_OUTCOME_ESCALATE = sys.intern("escalate")
+
+
+# ctypes array types for common input_sources lengths, built once. Up to
+# _SPLAT_SOURCES_MAX elements the array constructor is cheaper than packing
+# through array.array; past that the packed buffer wins.
+_SOURCE_ARRAY_TYPES = {n: c_uint64 * n for n in range(1, 17)}
+_SPLAT_SOURCES_MAX = 4
+
+
+def _make_allow(event_id: int) -> Decision:
+    """Decision for the common allow case (positional init, no kwargs)."""
+    return Decision(True, _OUTCOME_ALLOW, event_id, None, None)
+
+
+# C prototypes from chitin.h as (argtypes, restype). Applied once when the CDLL
+# is loaded; the Cython wrapper calls the symbols directly and ignores them.
+_SIGNATURES: dict[str, tuple[list[Any], Any]] = {
+    # chitin_engine_t chitin_engine_new(const char* config_path, size_t config_path_len);
+    "chitin_engine_new": ([c_char_p, c_size_t], c_void_p),
+    # void chitin_engine_free(chitin_engine_t engine);
+    "chitin_engine_free": ([c_void_p], None),
+    # chitin_status_t chitin_ingest(...);
+    "chitin_ingest": (
+        [
             c_void_p,
             c_char_p,
             c_size_t,
@@ -57,11 +71,12 @@ class _ChitinFFI:
             c_char_p,
             c_size_t,
             POINTER(c_uint64),
-        ]
-        lib.chitin_ingest.restype = c_int32
-
-        # chitin_status_t chitin_propose(...);
-        lib.chitin_propose.argtypes = [
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_propose(...);
+    "chitin_propose": (
+        [
             c_void_p,
             c_char_p,
             c_size_t,
@@ -72,165 +87,408 @@ class _ChitinFFI:
             POINTER(c_uint64),
             c_size_t,
             POINTER(c_uint64),
-        ]
-        lib.chitin_propose.restype = c_int32
-
-        # chitin_status_t chitin_record_result(...);
-        lib.chitin_record_result.argtypes = [
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_record_result(...);
+    "chitin_record_result": (
+        [
             c_void_p,
             c_uint64,
             c_char_p,
             c_size_t,
             c_int32,
             POINTER(c_uint64),
-        ]
-        lib.chitin_record_result.restype = c_int32
-
-        # chitin_status_t chitin_is_traced(...);
-        lib.chitin_is_traced.argtypes = [
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_is_traced(...);
+    "chitin_is_traced": (
+        [
             c_void_p,
             c_uint64,
             c_char_p,
             c_size_t,
             POINTER(c_int32),
-        ]
-        lib.chitin_is_traced.restype = c_int32
-
-        # chitin_status_t chitin_set_label(engine, event_id, label, label_len);
-        lib.chitin_set_label.argtypes = [c_void_p, c_uint64, c_char_p, c_size_t]
-        lib.chitin_set_label.restype = c_int32
-
-        # chitin_status_t chitin_explain(...);
-        # Use c_void_p for output pointer so .value gives raw address (not Python bytes)
-        lib.chitin_explain.argtypes = [
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_set_label(engine, event_id, label, label_len);
+    "chitin_set_label": ([c_void_p, c_uint64, c_char_p, c_size_t], c_int32),
+    # chitin_status_t chitin_explain(...);
+    # Use c_void_p for output pointer so .value gives raw address (not Python bytes)
+    "chitin_explain": (
+        [
             c_void_p,
             c_uint64,
             POINTER(c_void_p),
             POINTER(c_size_t),
-        ]
-        lib.chitin_explain.restype = c_int32
-
-        # chitin_status_t chitin_last_error(char** out_json, size_t* out_json_len);
-        lib.chitin_last_error.argtypes = [POINTER(c_void_p), POINTER(c_size_t)]
-        lib.chitin_last_error.restype = c_int32
-
-        # void chitin_free_string(char* ptr, size_t len);
-        lib.chitin_free_string.argtypes = [c_void_p, c_size_t]
-        lib.chitin_free_string.restype = None
-
-        # chitin_status_t chitin_register_tool(...);
-        lib.chitin_register_tool.argtypes = [
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_last_error(char** out_json, size_t* out_json_len);
+    "chitin_last_error": ([POINTER(c_void_p), POINTER(c_size_t)], c_int32),
+    # void chitin_free_string(char* ptr, size_t len);
+    "chitin_free_string": ([c_void_p, c_size_t], None),
+    # chitin_status_t chitin_register_tool(...);
+    "chitin_register_tool": (
+        [
+            c_void_p,
+            c_char_p,
+            c_size_t,
+            c_char_p,
+            c_size_t,
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_load_policies_yaml(engine, yaml, yaml_len);
+    "chitin_load_policies_yaml": ([c_void_p, c_char_p, c_size_t], c_int32),
+}
+
+# Entry points only newer engines export; callers fall back when absent.
+_OPTIONAL_SIGNATURES: dict[str, tuple[list[Any], Any]] = {
+    # chitin_status_t chitin_ingest_batch(engine, contents, offsets, count,
+    #     trust_levels, metadata_json, metadata_len, out_ids);
+    # offsets has count + 1 entries; metadata_json is a JSON array (or NULL).
+    "chitin_ingest_batch": (
+        [
+            c_void_p,
+            c_char_p,
+            POINTER(c_size_t),
+            c_size_t,
+            POINTER(c_int32),
+            c_char_p,
+            c_size_t,
+            POINTER(c_uint64),
+        ],
+        c_int32,
+    ),
+    # chitin_status_t chitin_propose_ex(<chitin_propose args>,
+    #     char** out_rule_id, size_t* out_rule_id_len,
+    #     char** out_reason, size_t* out_reason_len);
+    # The strings are set only for deny/escalate; free with chitin_free_string.
+    "chitin_propose_ex": (
+        [
             c_void_p,
             c_char_p,
             c_size_t,
             c_char_p,
             c_size_t,
-        ]
-        lib.chitin_register_tool.restype = c_int32
+            c_char_p,
+            c_size_t,
+            POINTER(c_uint64),
+            c_size_t,
+            POINTER(c_uint64),
+            POINTER(c_void_p),
+            POINTER(c_size_t),
+            POINTER(c_void_p),
+            POINTER(c_size_t),
+        ],
+        c_int32,
+    ),
+}
+
+
+def _to_buf(s: str | bytes | None) -> tuple[bytes | None, int]:
+    if s is None:
+        return None, 0
+    b = s if isinstance(s, bytes) else s.encode()
+    return b, len(b)
+
+
+@functools.lru_cache(maxsize=256)
+def _name_buf(s: str) -> tuple[bytes, int]:
+    """_to_buf for short strings that repeat (tool names, labels, agent ids)."""
+    b = s.encode()
+    return b, len(b)
+
+
+_json_str = json.encoder.encode_basestring_ascii
+
+
+@functools.lru_cache(maxsize=256)
+def _tool_config(risk: str, category: str | None) -> bytes:
+    """Serialize chitin_register_tool's fixed {"risk", "category"} config."""
+    if category is None:
+        return f'{{"risk":{_json_str(risk)}}}'.encode("ascii")
+    return f'{{"risk":{_json_str(risk)},"category":{_json_str(category)}}}'.encode("ascii")
+
+
+# Loaded once per process and shared by every Engine; see resolve_chitin_lib.
+_CACHED_LIB: ctypes.CDLL | None = None
+
+
+def _load_lib() -> ctypes.CDLL:
+    global _CACHED_LIB
+    if _CACHED_LIB is not None:
+        return _CACHED_LIB
+    path = resolve_chitin_lib()
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError as e:
+        raise OSError(_load_lib_error_message()) from e
+    _setup_signatures(lib)
+    _CACHED_LIB = lib
+    return lib
+
+
+def _setup_signatures(lib: ctypes.CDLL) -> None:
+    for name, (argtypes, restype) in _SIGNATURES.items():
+        fn = getattr(lib, name)
+        fn.argtypes = argtypes
+        fn.restype = restype
+    for name, (argtypes, restype) in _OPTIONAL_SIGNATURES.items():
+        fn = getattr(lib, name, None)
+        if fn is not None:
+            fn.argtypes = argtypes
+            fn.restype = restype
 
-        # chitin_status_t chitin_load_policies_yaml(engine, yaml, yaml_len);
-        lib.chitin_load_policies_yaml.argtypes = [c_void_p, c_char_p, c_size_t]
-        lib.chitin_load_policies_yaml.restype = c_int32
+
+class _OutParams(threading.local):
+    """Per-thread out-parameters for _ChitinFFI and their byref() wrappers."""
+
+    def __init__(self) -> None:
+        self.one_source = (c_uint64 * 1)()
+        self.id = c_uint64()
+        self.id_ref = ctypes.byref(self.id)
+        self.result = c_int32()
+        self.result_ref = ctypes.byref(self.result)
+        self.ptr = c_void_p()
+        self.ptr_ref = ctypes.byref(self.ptr)
+        self.len = c_size_t()
+        self.len_ref = ctypes.byref(self.len)
+        self.err_ptr = c_void_p()
+        self.err_ptr_ref = ctypes.byref(self.err_ptr)
+        self.err_len = c_size_t()
+        self.err_len_ref = ctypes.byref(self.err_len)
+        self.rule_ptr = c_void_p()
+        self.rule_ptr_ref = ctypes.byref(self.rule_ptr)
+        self.rule_len = c_size_t()
+        self.rule_len_ref = ctypes.byref(self.rule_len)
+        self.reason_ptr = c_void_p()
+        self.reason_ptr_ref = ctypes.byref(self.reason_ptr)
+        self.reason_len = c_size_t()
+        self.reason_len_ref = ctypes.byref(self.reason_len)
+
+
+class _ChitinFFI:
+    """
+    Holds the loaded library and wraps C ABI calls.
+
+    Out-parameters are preallocated once per thread and zeroed before each
+    call, so an instance can be shared across threads.
+    """
+
+    def __init__(self, lib: ctypes.CDLL) -> None:
+        self._lib = lib
+
+        # Bound C functions, looked up once instead of per call.
+        self._engine_new = lib.chitin_engine_new
+        self._engine_free = lib.chitin_engine_free
+        self._ingest = lib.chitin_ingest
+        self._propose = lib.chitin_propose
+        self._record_result = lib.chitin_record_result
+        self._is_traced = lib.chitin_is_traced
+        self._set_label = lib.chitin_set_label
+        self._explain = lib.chitin_explain
+        self._last_error_fn = lib.chitin_last_error
+        self._free_string = lib.chitin_free_string
+        self._register_tool = lib.chitin_register_tool
+        self._load_policies_yaml = lib.chitin_load_policies_yaml
+        self._ingest_batch = getattr(lib, "chitin_ingest_batch", None)
+        self._propose_ex = getattr(lib, "chitin_propose_ex", None)
+
+        # Reused out-parameters; per thread since ctypes releases the GIL in calls.
+        self._out = _OutParams()
+
+    def _take_string(self, ptr: c_void_p, length: c_size_t) -> str | None:
+        """Decode and free a string the engine returned through an out-param."""
+        addr = ptr.value
+        if not addr:
+            return None
+        n = length.value
+        try:
+            return ctypes.string_at(addr, n).decode("utf-8")
+        finally:
+            self._free_string(addr, n)
 
     def _last_error(self) -> str:
-        out_ptr = c_void_p()
-        out_len = c_size_t(0)
-        st = self._lib.chitin_last_error(ctypes.byref(out_ptr), ctypes.byref(out_len))
-        if st == CHITIN_ERR_NOT_FOUND or not out_ptr.value:
+        out = self._out
+        err_ptr = out.err_ptr
+        err_ptr.value = None
+        st = self._last_error_fn(out.err_ptr_ref, out.err_len_ref)
+        ptr = err_ptr.value
+        if st == CHITIN_ERR_NOT_FOUND or not ptr:
             return "unknown error"
+        n = out.err_len.value
         try:
-            raw = ctypes.string_at(out_ptr.value, out_len.value)
+            raw = ctypes.string_at(ptr, n)
             return raw.decode("utf-8")
         finally:
-            self._lib.chitin_free_string(out_ptr.value, out_len.value)
+            self._free_string(ptr, n)
 
     def engine_new(self, config_path: str | None) -> c_void_p:
         path_buf, path_len = _to_buf(config_path)
-        engine = self._lib.chitin_engine_new(path_buf, path_len or 0)
+        engine = self._engine_new(path_buf, path_len or 0)
         if engine is None:
             raise ChitinError(CHITIN_ERR_INTERNAL, self._last_error())
         return engine
 
     def engine_free(self, engine: c_void_p) -> None:
-        self._lib.chitin_engine_free(engine)
+        self._engine_free(engine)
 
     def ingest(
         self,
         engine: c_void_p,
-        content: str,
+        content: str | bytes,
         trust_level: int,
-        metadata: dict | None,
+        metadata: dict | None = None,
     ) -> int:
+        out = self._out
         content_buf, content_len = _to_buf(content)
-        meta_str = None
         meta_len = 0
         if metadata is not None:
-            import json
-            meta_str = json.dumps(metadata)
-            meta_buf, meta_len = _to_buf(meta_str)
+            meta_buf, meta_len = _to_buf(dumps(metadata))
         else:
             meta_buf = None
-        out_id = c_uint64(0)
-        st = self._lib.chitin_ingest(
+        out.id.value = 0
+        st = self._ingest(
             engine,
             content_buf,
             content_len,
-            c_int32(trust_level),
+            trust_level,
+            meta_buf,
+            meta_len,
+            out.id_ref,
+        )
+        if st != CHITIN_OK:
+            raise ChitinError(st, self._last_error())
+        return out.id.value
+
+    def ingest_batch(
+        self,
+        engine: c_void_p,
+        events: list[tuple[str | bytes, int, dict | None]],
+    ) -> list[int]:
+        if self._ingest_batch is None:
+            return [self.ingest(engine, c, t, m) for c, t, m in events]
+        count = len(events)
+        if count == 0:
+            return []
+        chunks = []
+        offsets = (c_size_t * (count + 1))()
+        trust_levels = (c_int32 * count)()
+        metas = []
+        has_meta = False
+        pos = 0
+        for i, (content, trust_level, metadata) in enumerate(events):
+            b = content if isinstance(content, bytes) else content.encode("utf-8")
+            chunks.append(b)
+            offsets[i] = pos
+            pos += len(b)
+            trust_levels[i] = trust_level
+            metas.append(metadata)
+            has_meta = has_meta or metadata is not None
+        offsets[count] = pos
+        meta_buf, meta_len = _to_buf(dumps(metas)) if has_meta else (None, 0)
+        out_ids = (c_uint64 * count)()
+        st = self._ingest_batch(
+            engine,
+            b"".join(chunks),
+            offsets,
+            count,
+            trust_levels,
             meta_buf,
             meta_len,
-            ctypes.byref(out_id),
+            out_ids,
         )
         if st != CHITIN_OK:
             raise ChitinError(st, self._last_error())
-        return out_id.value
+        return list(out_ids)
 
     def propose(
         self,
         engine: c_void_p,
         tool: str,
-        params: str,
-        agent_id: str | None,
-        input_sources: list[int] | None,
+        params: str | bytes,
+        agent_id: str | None = None,
+        input_sources: list[int] | None = None,
     ) -> Decision:
-        tool_buf, tool_len = _to_buf(tool)
+        out = self._out
+        tool_buf, tool_len = _name_buf(tool)
         params_buf, params_len = _to_buf(params)
-        agent_buf, agent_len = _to_buf(agent_id)
+        agent_buf, agent_len = _name_buf(agent_id) if agent_id is not None else (None, 0)
         sources_arr = None
         sources_len = 0
         if input_sources:
-            arr_type = c_uint64 * len(input_sources)
-            sources_arr = arr_type(*input_sources)
             sources_len = len(input_sources)
-        out_id = c_uint64(0)
-        st = self._lib.chitin_propose(
-            engine,
-            tool_buf,
-            tool_len,
-            params_buf,
-            params_len,
-            agent_buf,
-            agent_len,
-            sources_arr,
-            sources_len,
-            ctypes.byref(out_id),
-        )
+            if sources_len == 1:
+                sources_arr = out.one_source
+                sources_arr[0] = input_sources[0]
+            else:
+                arr_type = _SOURCE_ARRAY_TYPES.get(sources_len) or c_uint64 * sources_len
+                if sources_len <= _SPLAT_SOURCES_MAX:
+                    sources_arr = arr_type(*input_sources)
+                else:
+                    # array.array packs in C; ctypes then aliases its buffer without copying.
+                    sources_buf = array.array("Q", input_sources)
+                    sources_arr = arr_type.from_buffer(sources_buf)
+        out.id.value = 0
+        propose_ex = self._propose_ex
+        if propose_ex is not None:
+            out.rule_ptr.value = None
+            out.reason_ptr.value = None
+            st = propose_ex(
+                engine,
+                tool_buf,
+                tool_len,
+                params_buf,
+                params_len,
+                agent_buf,
+                agent_len,
+                sources_arr,
+                sources_len,
+                out.id_ref,
+                out.rule_ptr_ref,
+                out.rule_len_ref,
+                out.reason_ptr_ref,
+                out.reason_len_ref,
+            )
+        else:
+            st = self._propose(
+                engine,
+                tool_buf,
+                tool_len,
+                params_buf,
+                params_len,
+                agent_buf,
+                agent_len,
+                sources_arr,
+                sources_len,
+                out.id_ref,
+            )
+        event_id = out.id.value
         if st == CHITIN_OK:
-            return Decision(allowed=True, outcome="allow", event_id=out_id.value, rule_id=None, reason=None)
+            return _make_allow(event_id)
         if st in (CHITIN_ERR_DENIED, CHITIN_ERR_ESCALATED):
-            err_json = self._last_error()
-            import json
-            try:
-                obj = json.loads(err_json)
-                rule_id = obj.get("rule_id")
-                reason = obj.get("reason", "")
-            except Exception:
-                rule_id = None
-                reason = err_json
-            outcome = "deny" if st == CHITIN_ERR_DENIED else "escalate"
+            if propose_ex is not None:
+                rule_id = self._take_string(out.rule_ptr, out.rule_len)
+                reason = self._take_string(out.reason_ptr, out.reason_len) or ""
+            else:
+                # Older engines only report the firing rule via the last-error JSON.
+                err_json = self._last_error()
+                try:
+                    obj = loads(err_json)
+                    rule_id = obj.get("rule_id")
+                    reason = obj.get("reason", "")
+                except Exception:
+                    rule_id = None
+                    reason = err_json
+            outcome = _OUTCOME_DENY if st == CHITIN_ERR_DENIED else _OUTCOME_ESCALATE
             return Decision(
                 allowed=False,
                 outcome=outcome,
-                event_id=out_id.value,
+                event_id=event_id,
                 rule_id=rule_id,
                 reason=reason,
             )
@@ -241,63 +499,91 @@ class _ChitinFFI:
         engine: c_void_p,
         tool_call_id: int,
         output: str,
-        exit_code: int,
+        exit_code: int = 0,
     ) -> int:
+        out = self._out
         out_buf, out_len = _to_buf(output)
-        out_id = c_uint64(0)
-        st = self._lib.chitin_record_result(
+        out.id.value = 0
+        st = self._record_result(
             engine,
-            c_uint64(tool_call_id),
+            tool_call_id,
             out_buf,
             out_len,
-            c_int32(exit_code),
-            ctypes.byref(out_id),
+            exit_code,
+            out.id_ref,
         )
         if st != CHITIN_OK:
             raise ChitinError(st, self._last_error())
-        return out_id.value
+        return out.id.value
 
     def is_traced(self, engine: c_void_p, event_id: int, label: str) -> bool:
-        label_buf, label_len = _to_buf(label)
-        out_result = c_int32(0)
-        st = self._lib.chitin_is_traced(
+        out = self._out
+        label_buf, label_len = _name_buf(label)
+        out.result.value = 0
+        st = self._is_traced(
             engine,
-            c_uint64(event_id),
+            event_id,
             label_buf,
             label_len,
-            ctypes.byref(out_result),
+            out.result_ref,
         )
         if st != CHITIN_OK:
             raise ChitinError(st, self._last_error())
-        return out_result.value != 0
+        return out.result.value != 0
+
+    def is_traced_many(self, engine: c_void_p, event_ids: list[int], label: str) -> list[bool]:
+        out = self._out
+        label_buf, label_len = _name_buf(label)
+        is_traced = self._is_traced
+        out_ref = out.result_ref
+        out_result = out.result
+        results = []
+        for event_id in event_ids:
+            out_result.value = 0
+            st = is_traced(engine, event_id, label_buf, label_len, out_ref)
+            if st != CHITIN_OK:
+                raise ChitinError(st, self._last_error())
+            results.append(out_result.value != 0)
+        return results
+
+    def is_traced_raw_capsule(self, engine: c_void_p) -> Any:
+        if _capsule_new is None:
+            raise ChitinError(CHITIN_ERR_INVALID, "is_traced_raw_capsule requires CPython")
+        fn_addr = ctypes.cast(self._is_traced, c_void_p).value
+        capsule = _capsule_new(fn_addr, IS_TRACED_SIGNATURE, None)
+        _capsule_set_context(capsule, engine)
+        return capsule
 
     def set_label(self, engine: c_void_p, event_id: int, label: str) -> None:
-        label_buf, label_len = _to_buf(label)
-        st = self._lib.chitin_set_label(engine, c_uint64(event_id), label_buf, label_len)
+        label_buf, label_len = _name_buf(label)
+        st = self._set_label(engine, event_id, label_buf, label_len)
         if st != CHITIN_OK:
             raise ChitinError(st, self._last_error())
 
     def explain(self, engine: c_void_p, event_id: int) -> ExplainResult:
-        out_ptr = c_void_p()
-        out_len = c_size_t(0)
-        st = self._lib.chitin_explain(
+        out = self._out
+        out_ptr = out.ptr
+        out_ptr.value = None
+        out.len.value = 0
+        st = self._explain(
             engine,
-            c_uint64(event_id),
-            ctypes.byref(out_ptr),
-            ctypes.byref(out_len),
+            event_id,
+            out.ptr_ref,
+            out.len_ref,
         )
         if st != CHITIN_OK:
             raise ChitinError(st, self._last_error())
-        if not out_ptr.value or out_len.value == 0:
+        ptr = out_ptr.value
+        n = out.len.value
+        if not ptr or n == 0:
             return ExplainResult(text="", trace_chain=[])
         try:
-            raw = ctypes.string_at(out_ptr.value, out_len.value)
+            raw = ctypes.string_at(ptr, n)
             text = raw.decode("utf-8")
         finally:
-            self._lib.chitin_free_string(out_ptr.value, out_len.value)
-        import json
+            self._free_string(ptr, n)
         try:
-            obj = json.loads(text)
+            obj = loads(text)
             return ExplainResult(
                 text=obj.get("text", ""),
                 trace_chain=obj.get("trace_chain", []),
@@ -307,7 +593,7 @@ class _ChitinFFI:
 
     def load_policies_yaml(self, engine: c_void_p, yaml_str: str) -> None:
         yaml_buf, yaml_len = _to_buf(yaml_str)
-        st = self._lib.chitin_load_policies_yaml(engine, yaml_buf, yaml_len)
+        st = self._load_policies_yaml(engine, yaml_buf, yaml_len)
         if st != CHITIN_OK:
             raise ChitinError(st, self._last_error())
 
@@ -315,17 +601,12 @@ class _ChitinFFI:
         self,
         engine: c_void_p,
         name: str,
-        risk: str,
-        category: str | None,
+        risk: str = "medium",
+        category: str | None = None,
     ) -> None:
-        import json
-        config = {"risk": risk}
-        if category is not None:
-            config["category"] = category
-        config_json = json.dumps(config)
-        name_buf, name_len = _to_buf(name)
-        config_buf, config_len = _to_buf(config_json)
-        st = self._lib.chitin_register_tool(
+        name_buf, name_len = _name_buf(name)
+        config_buf, config_len = _to_buf(_tool_config(risk, category))
+        st = self._register_tool(
             engine,
             name_buf,
             name_len,
@@ -336,6 +617,16 @@ class _ChitinFFI:
             raise ChitinError(st, self._last_error())
 
 
-def load_ffi() -> _ChitinFFI:
-    """Load the chitin library and return the FFI wrapper. Raises ChitinError if load fails."""
-    return _ChitinFFI()
+def load_ffi() -> Any:
+    """
+    Load the chitin library and return the FFI wrapper. Raises ChitinError if load fails.
+
+    Prefers the compiled Cython wrapper (chitin._cyffi) when it is importable;
+    falls back to the ctypes wrapper (_ChitinFFI) on PyPy or pure wheels.
+    """
+    lib = _load_lib()
+    try:
+        from chitin._cyffi import CyFFI
+    except ImportError:
+        return _ChitinFFI(lib)
+    return CyFFI(lib)
@@ -1,10 +1,13 @@
 """HTTP client for the chitin-sidecar. Same semantics as the C ABI."""
 
-import json
-import urllib.error
-import urllib.request
+import http.client
+import sys
+import threading
+import weakref
 from typing import Any
+from urllib.parse import urlsplit
 
+from chitin._json import decode_propose, dumps, loads
 from chitin._types import ChitinError, Decision, ExplainResult
 
 # Status codes (match C ABI)
@@ -15,47 +18,163 @@ CHITIN_ERR_ESCALATED = -3
 CHITIN_ERR_INTERNAL = -4
 CHITIN_ERR_NOT_FOUND = -5
 
+_OUTCOME_ALLOW = sys.intern("allow")
+_OUTCOME_DENY = sys.intern("deny")
+_OUTCOME_ESCALATE = sys.intern("escalate")
+# Maps decoded outcome strings onto the shared interned constants.
+_OUTCOMES = {o: o for o in (_OUTCOME_ALLOW, _OUTCOME_DENY, _OUTCOME_ESCALATE)}
+
+# Fixed request headers; Content-Length is added per request.
+_HEADERS = (
+    ("Content-Type", "application/json"),
+    ("Connection", "keep-alive"),
+)
+
+# Raised when the sidecar has dropped an idle keep-alive connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class _ConnSlot:
+    """One thread's keep-alive connection, closed when the thread exits."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self) -> None:
+        self.conn: http.client.HTTPConnection | None = None
+
+    def __del__(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+
+
+class _NotFound(ChitinError):
+    """HTTP 404 from the sidecar, e.g. a route an older sidecar lacks."""
+
+
+def _as_str(s: str | bytes) -> str:
+    return s.decode("utf-8") if isinstance(s, bytes) else s
+
 
 class _ChitinHTTP:
     """HTTP backend that talks to chitin-sidecar. Uses CHITIN_SIDECAR_URL."""
 
     def __init__(self, base_url: str) -> None:
-        self._base = base_url.rstrip("/")
+        parts = urlsplit(base_url.rstrip("/"))
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port
+        self._base_path = parts.path
+        # One keep-alive connection per thread: http.client connections are
+        # not safe to share, and a single lock would serialize every call.
+        # Slots are held by the thread's locals and only weakly here, so a
+        # thread's connection closes when the thread exits.
+        self._local = threading.local()
+        self._slots: weakref.WeakSet[_ConnSlot] = weakref.WeakSet()
+        self._slots_lock = threading.Lock()
+        # Cleared when the sidecar turns out not to serve /ingest_batch.
+        self._has_ingest_batch = True
 
-    def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
-        url = f"{self._base}{path}"
-        data = json.dumps(body).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+    def _slot(self) -> _ConnSlot:
+        try:
+            return self._local.slot
+        except AttributeError:
+            slot = self._local.slot = _ConnSlot()
+            with self._slots_lock:
+                self._slots.add(slot)
+            return slot
+
+    def _connect(self, slot: _ConnSlot) -> http.client.HTTPConnection:
+        if self._https:
+            conn = http.client.HTTPSConnection(self._host, self._port)
+        else:
+            conn = http.client.HTTPConnection(self._host, self._port)
+        slot.conn = conn
+        return conn
+
+    @staticmethod
+    def _discard(slot: _ConnSlot, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+        if slot.conn is conn:
+            slot.conn = None
+
+    def _roundtrip(
+        self, slot: _ConnSlot, conn: http.client.HTTPConnection, path: str, data: bytes
+    ) -> tuple[int, str, bytes]:
         try:
-            with urllib.request.urlopen(req) as resp:
-                raw = resp.read()
-                if resp.status == 204 or not raw:
-                    return {}
-                return json.loads(raw.decode("utf-8"))
-        except urllib.error.HTTPError as e:
+            # Lower-level than conn.request(): no per-call header-name scan or
+            # body-length inference; Host is still added by putrequest.
+            conn.putrequest("POST", self._base_path + path, skip_accept_encoding=True)
+            for name, value in _HEADERS:
+                conn.putheader(name, value)
+            conn.putheader("Content-Length", str(len(data)))
+            conn.endheaders(data)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except BaseException:
+            self._discard(slot, conn)
+            raise
+        if resp.will_close:
+            self._discard(slot, conn)
+        return resp.status, resp.reason, raw
+
+    def _send(self, path: str, data: bytes) -> tuple[int, str, bytes]:
+        slot = self._slot()
+        conn = slot.conn
+        if conn is not None:
             try:
-                payload = json.loads(e.read().decode("utf-8"))
+                return self._roundtrip(slot, conn, path, data)
+            except _STALE_CONNECTION_ERRORS:
+                pass  # reconnect once below
+        return self._roundtrip(slot, self._connect(slot), path, data)
+
+    def _post_raw(self, path: str, body: dict[str, Any]) -> bytes:
+        data = dumps(body)
+        try:
+            status, reason, raw = self._send(path, data)
+        except (OSError, http.client.HTTPException) as e:
+            raise ChitinError(CHITIN_ERR_INTERNAL, str(e)) from e
+        if status >= 400:
+            try:
+                payload = loads(raw)
             except Exception:
                 payload = {}
-            status = payload.get("status", CHITIN_ERR_INTERNAL)
-            msg = payload.get("error", str(e))
-            raise ChitinError(status, msg) from e
-        except urllib.error.URLError as e:
-            raise ChitinError(CHITIN_ERR_INTERNAL, str(e.reason)) from e
+            error = _NotFound if status == 404 else ChitinError
+            raise error(
+                payload.get("status", CHITIN_ERR_INTERNAL),
+                payload.get("error", f"HTTP Error {status}: {reason}"),
+            )
+        if status == 204:
+            return b""
+        return raw
+
+    def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        raw = self._post_raw(path, body)
+        if not raw:
+            return {}
+        return loads(raw)
+
+    def close(self) -> None:
+        """Close every keep-alive connection to the sidecar."""
+        with self._slots_lock:
+            slots = list(self._slots)
+        for slot in slots:
+            conn, slot.conn = slot.conn, None
+            if conn is not None:
+                conn.close()
 
     def ingest(
         self,
-        content: str,
+        content: str | bytes,
         trust_level: int,
-        metadata: dict | None,
+        metadata: dict | None = None,
     ) -> int:
         body: dict[str, Any] = {
-            "content": content,
+            "content": _as_str(content),
             "trust": trust_level,
         }
         if metadata is not None:
@@ -66,23 +185,57 @@ class _ChitinHTTP:
             raise ChitinError(status, out.get("error", "ingest failed"))
         return int(out["event_id"])
 
+    def ingest_batch(
+        self,
+        events: list[tuple[str | bytes, int, dict | None]],
+    ) -> list[int]:
+        if not self._has_ingest_batch:
+            return [self.ingest(c, t, m) for c, t, m in events]
+        items: list[dict[str, Any]] = []
+        for content, trust_level, metadata in events:
+            item: dict[str, Any] = {"content": _as_str(content), "trust": trust_level}
+            if metadata is not None:
+                item["metadata"] = metadata
+            items.append(item)
+        try:
+            out = self._post("/ingest_batch", {"events": items})
+        except _NotFound:
+            # Older sidecars have no batch route; ingest one event at a time.
+            self._has_ingest_batch = False
+            return [self.ingest(c, t, m) for c, t, m in events]
+        status = out.get("status", CHITIN_OK)
+        if status != CHITIN_OK:
+            raise ChitinError(status, out.get("error", "ingest_batch failed"))
+        return [int(i) for i in out["event_ids"]]
+
     def propose(
         self,
         tool: str,
-        params: str,
-        agent_id: str | None,
-        input_sources: list[int] | None,
+        params: str | bytes,
+        agent_id: str | None = None,
+        input_sources: list[int] | None = None,
     ) -> Decision:
-        body: dict[str, Any] = {"tool": tool, "params": params}
+        body: dict[str, Any] = {"tool": tool, "params": _as_str(params)}
         if agent_id is not None:
             body["agent_id"] = agent_id
         if input_sources is not None:
             body["input_sources"] = input_sources
-        out = self._post("/propose", body)
+        raw = self._post_raw("/propose", body)
+        resp = decode_propose(raw) if raw else None
+        if resp is not None:
+            return Decision(
+                resp.allowed,
+                _OUTCOMES.get(resp.outcome, resp.outcome),
+                resp.event_id,
+                resp.rule_id,
+                resp.reason,
+            )
+        out = loads(raw) if raw else {}
+        outcome = out.get("outcome", _OUTCOME_DENY)
         # Sidecar always returns 200 with status in body
         return Decision(
             allowed=bool(out.get("allowed", False)),
-            outcome=out.get("outcome", "deny"),
+            outcome=_OUTCOMES.get(outcome, outcome),
             event_id=int(out["event_id"]),
             rule_id=out.get("rule_id"),
             reason=out.get("reason"),
@@ -92,7 +245,7 @@ class _ChitinHTTP:
         self,
         tool_call_id: int,
         output: str,
-        exit_code: int,
+        exit_code: int = 0,
     ) -> int:
         out = self._post(
             "/record_result",
@@ -112,6 +265,15 @@ class _ChitinHTTP:
             )
         return bool(out.get("traced", False))
 
+    def is_traced_many(self, event_ids: list[int], label: str) -> list[bool]:
+        return [self.is_traced(event_id, label) for event_id in event_ids]
+
+    def is_traced_raw_capsule(self) -> Any:
+        raise ChitinError(
+            CHITIN_ERR_INVALID,
+            "is_traced_raw_capsule requires the native library backend",
+        )
+
     def set_label(self, event_id: int, label: str) -> None:
         self._post("/set_label", {"event_id": event_id, "label": label})
 
@@ -131,8 +293,8 @@ class _ChitinHTTP:
     def register_tool(
         self,
         name: str,
-        risk: str,
-        category: str | None,
+        risk: str = "medium",
+        category: str | None = None,
     ) -> None:
         body: dict[str, Any] = {"tool_name": name, "risk": risk}
         if category is not None:
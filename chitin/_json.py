@@ -0,0 +1,57 @@
+"""JSON codec shared by the backends. Uses msgspec or orjson when installed."""
+
+import json
+from typing import Any
+
+try:
+    import msgspec
+except ImportError:  # optional speedup
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+if orjson is not None:
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+elif msgspec is not None:
+    dumps = msgspec.json.encode
+    loads = msgspec.json.decode
+else:
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    loads = json.loads
+
+
+if msgspec is not None:
+
+    class _ProposeResp(msgspec.Struct):
+        """Typed /propose response; decoded without building a dict."""
+
+        event_id: int
+        allowed: bool = False
+        outcome: str = "deny"
+        rule_id: str | None = None
+        reason: str | None = None
+
+    _propose_decoder = msgspec.json.Decoder(_ProposeResp)
+
+    def decode_propose(raw: bytes) -> Any:
+        """Decode a /propose body into a struct, or None if it does not fit the schema."""
+        try:
+            return _propose_decoder.decode(raw)
+        except msgspec.ValidationError:
+            return None
+
+else:
+
+    def decode_propose(raw: bytes) -> Any:
+        return None
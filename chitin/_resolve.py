@@ -1,24 +1,25 @@
 """Resolve path to the chitin shared library."""
 
+import functools
 import os
-import platform
-from pathlib import Path
+import stat
+import sys
+from collections.abc import Iterator
 
-# Library filename for current platform
-_LIB_NAMES = {
-    "Linux": "libchitin.so",
-    "Darwin": "libchitin.dylib",
-    "Windows": "chitin.dll",
-}
-
-
-def _lib_name() -> str:
-    return _LIB_NAMES.get(platform.system(), "libchitin.so")
+# Library filename for current platform (sys.platform avoids importing platform)
+_LIB_NAME = {
+    "linux": "libchitin.so",
+    "darwin": "libchitin.dylib",
+    "win32": "chitin.dll",
+}.get(sys.platform, "libchitin.so")
 
 
+@functools.lru_cache(maxsize=1)
 def resolve_chitin_lib() -> str:
     """
-    Resolve path to the chitin shared library.
+    Resolve path to the chitin shared library. The result is cached for the
+    life of the process, so changes to CHITIN_LIB_PATH after the first call
+    are ignored.
 
     Order:
     1. CHITIN_LIB_PATH environment variable (explicit path)
@@ -30,31 +31,35 @@ def resolve_chitin_lib() -> str:
     Returns a path string or the library name for CDLL. Caller must try
     ctypes.CDLL(result); on OSError, raise with a helpful message.
     """
-    lib_name = _lib_name()
+    for path in _candidates(_LIB_NAME):
+        # One stat() per candidate; anything missing or not a regular file is skipped.
+        try:
+            if stat.S_ISREG(os.stat(path).st_mode):
+                return path
+        except OSError:
+            pass
+
+    # 5. System search (LD_LIBRARY_PATH, DYLD_LIBRARY_PATH, PATH)
+    return _LIB_NAME
 
+
+def _candidates(lib_name: str) -> Iterator[str]:
+    """Yield candidate paths lazily, so an explicit CHITIN_LIB_PATH is checked first."""
     # 1. Explicit path
     env_path = os.environ.get("CHITIN_LIB_PATH")
-    if env_path and os.path.isfile(env_path):
-        return os.path.abspath(env_path)
+    if env_path:
+        yield os.path.abspath(env_path)
 
     # 2. Bundled in platform wheel (chitin/_lib/ next to this file)
-    bundled = Path(__file__).resolve().parent / "_lib" / lib_name
-    if bundled.exists():
-        return str(bundled)
+    pkg_dir = os.path.dirname(os.path.realpath(__file__))
+    yield os.path.join(pkg_dir, "_lib", lib_name)
 
     # 3. Dev: local target/release
-    dev_cwd = Path.cwd() / "target" / "release" / lib_name
-    if dev_cwd.is_file():
-        return str(dev_cwd)
+    yield os.path.join(os.getcwd(), "target", "release", lib_name)
 
     # 4. Dev: sibling chitin-engine repo (chitin-engine-lib/../chitin-engine/target/release/)
-    _repo_root = Path(__file__).resolve().parent.parent
-    sibling = _repo_root.parent / "chitin-engine" / "target" / "release" / lib_name
-    if sibling.is_file():
-        return str(sibling)
-
-    # 5. System search (LD_LIBRARY_PATH, DYLD_LIBRARY_PATH, PATH)
-    return lib_name
+    repo_parent = os.path.dirname(os.path.dirname(pkg_dir))
+    yield os.path.join(repo_parent, "chitin-engine", "target", "release", lib_name)
 
 
 def _load_lib_error_message() -> str:
@@ -13,7 +13,7 @@ class TrustLevel:
     UNKNOWN = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class Decision:
     """Result of proposing a tool call."""
 
@@ -24,7 +24,7 @@ class Decision:
     reason: str | None  # human-readable reason
 
 
-@dataclass
+@dataclass(slots=True)
 class ExplainResult:
     """Result of explaining an event's trace."""
 
@@ -38,4 +38,8 @@ class ChitinError(Exception):
     def __init__(self, status: int, message: str) -> None:
         self.status = status
         self.message = message
-        super().__init__(f"[{status}] {message}")
+        super().__init__(status, message)
+
+    def __str__(self) -> str:
+        # Formatted on demand; errors that are caught and dropped never pay for it.
+        return f"[{self.status}] {self.message}"
@@ -1,7 +1,15 @@
 """Setup script for platform-specific wheels that bundle the shared library.
 Used only by CI; do not use for the pure wheel (use pyproject.toml + build).
+
+CI builds every platform wheel on one Linux runner and retags it with
+--plat-name, so the Cython fast path (chitin._cyffi) is left out by default:
+a compiled extension would only import on the runner's own platform. Set
+CHITIN_BUILD_CYFFI=1 to compile it when building natively for the target
+(e.g. `python setup_platform.py build_ext --inplace` in development).
 """
-from setuptools import Distribution, setup
+import os
+
+from setuptools import Distribution, Extension, setup
 
 
 class PlatformDistribution(Distribution):
@@ -11,6 +19,19 @@ class PlatformDistribution(Distribution):
         return True
 
 
+def _ext_modules() -> list[Extension]:
+    if os.environ.get("CHITIN_BUILD_CYFFI") != "1":
+        return []
+    from Cython.Build import cythonize
+
+    # Fast-path bindings; symbols are resolved at runtime from the library
+    # _resolve.py finds, so nothing is linked here.
+    return cythonize(
+        [Extension("chitin._cyffi", ["chitin/_cyffi.pyx"])],
+        compiler_directives={"language_level": "3"},
+    )
+
+
 setup(
     name="chitin-engine-lib",
     version="0.1.2",
@@ -19,6 +40,7 @@ setup(
     python_requires=">=3.11",
     packages=["chitin"],
     package_data={"chitin": ["_lib/*", "py.typed"]},
+    ext_modules=_ext_modules(),
     distclass=PlatformDistribution,
     url="https://github.com/datagoboom/chitin-engine-lib",
 )
@@ -0,0 +1,196 @@
+/*
+ * Minimal stand-in for libchitin used by tests/test_ffi.py. Event ids encode
+ * the call's arguments so both FFI wrappers can be checked for identical
+ * marshalling. Build with -DCHITIN_STUB_EX to also export the optional
+ * chitin_ingest_batch / chitin_propose_ex entry points.
+ */
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+typedef struct {
+    uint64_t next;
+} stub_engine;
+
+/* Per-thread, like the real engine's last error. */
+static _Thread_local char last_error[256];
+static _Thread_local int has_error;
+
+static void set_error(const char *msg) {
+    snprintf(last_error, sizeof last_error, "%s", msg);
+    has_error = 1;
+}
+
+static char *copy_string(const char *s, size_t *len) {
+    size_t n = strlen(s);
+    char *out = malloc(n);
+    memcpy(out, s, n);
+    *len = n;
+    return out;
+}
+
+static uint64_t next_id(void *engine) {
+    return __atomic_fetch_add(&((stub_engine *)engine)->next, 1, __ATOMIC_RELAXED) * 1000000;
+}
+
+void *chitin_engine_new(const char *config_path, size_t config_path_len) {
+    if (config_path_len && memcmp(config_path, "missing", config_path_len) == 0) {
+        set_error("config not found");
+        return NULL;
+    }
+    stub_engine *engine = calloc(1, sizeof *engine);
+    engine->next = 1;
+    return engine;
+}
+
+void chitin_engine_free(void *engine) { free(engine); }
+
+int32_t chitin_ingest(void *engine, const char *content, size_t content_len,
+                      int32_t trust_level, const char *metadata,
+                      size_t metadata_len, uint64_t *out_id) {
+    if (trust_level > 4) {
+        set_error("invalid trust level");
+        return -1;
+    }
+    *out_id = next_id(engine) + metadata_len * 1000 + content_len * 10 + trust_level;
+    return 0;
+}
+
+static int32_t propose_common(void *engine, const char *tool, size_t tool_len,
+                              size_t agent_len, const uint64_t *sources,
+                              size_t sources_len, uint64_t *out_id) {
+    uint64_t sum = 0;
+    for (size_t i = 0; i < sources_len; i++)
+        sum += sources[i];
+    if (tool_len == 4 && memcmp(tool, "boom", 4) == 0) {
+        set_error("engine failure");
+        return -4;
+    }
+    /* deny/escalate leave out_id untouched, as the real engine may. */
+    if (tool_len == 4 && memcmp(tool, "deny", 4) == 0)
+        return -2;
+    if (tool_len == 8 && memcmp(tool, "escalate", 8) == 0)
+        return -3;
+    *out_id = next_id(engine) + agent_len * 100000 + sources_len * 1000 + sum % 1000;
+    return 0;
+}
+
+int32_t chitin_propose(void *engine, const char *tool, size_t tool_len,
+                       const char *params, size_t params_len, const char *agent_id,
+                       size_t agent_len, const uint64_t *sources,
+                       size_t sources_len, uint64_t *out_id) {
+    int32_t st = propose_common(engine, tool, tool_len, agent_len, sources,
+                                sources_len, out_id);
+    if (st == -2 || st == -3)
+        set_error("{\"rule_id\":\"r1\",\"reason\":\"blocked\"}");
+    return st;
+}
+
+int32_t chitin_record_result(void *engine, uint64_t tool_call_id,
+                             const char *output, size_t output_len,
+                             int32_t exit_code, uint64_t *out_id) {
+    if (tool_call_id == 0) {
+        set_error("tool call not found");
+        return -5;
+    }
+    *out_id = next_id(engine) + output_len * 10 + exit_code;
+    return 0;
+}
+
+int32_t chitin_is_traced(void *engine, uint64_t event_id, const char *label,
+                         size_t label_len, int32_t *out_result) {
+    if (event_id == 0) {
+        set_error("event not found");
+        return -5;
+    }
+    if ((event_id + label_len) % 2)
+        *out_result = 1;
+    return 0;
+}
+
+int32_t chitin_set_label(void *engine, uint64_t event_id, const char *label,
+                         size_t label_len) {
+    if (event_id == 0) {
+        set_error("event not found");
+        return -5;
+    }
+    return 0;
+}
+
+int32_t chitin_explain(void *engine, uint64_t event_id, char **out_json,
+                       size_t *out_json_len) {
+    char buf[128];
+    if (event_id == 0) {
+        set_error("event not found");
+        return -5;
+    }
+    if (event_id == 1)
+        return 0; /* nothing to explain */
+    if (event_id == 2)
+        snprintf(buf, sizeof buf, "not json");
+    else
+        snprintf(buf, sizeof buf, "{\"text\":\"event %llu\",\"trace_chain\":[%llu]}",
+                 (unsigned long long)event_id, (unsigned long long)event_id);
+    *out_json = copy_string(buf, out_json_len);
+    return 0;
+}
+
+int32_t chitin_last_error(char **out_json, size_t *out_json_len) {
+    if (!has_error)
+        return -5;
+    *out_json = copy_string(last_error, out_json_len);
+    return 0;
+}
+
+void chitin_free_string(char *ptr, size_t len) { free(ptr); }
+
+int32_t chitin_register_tool(void *engine, const char *name, size_t name_len,
+                             const char *config_json, size_t config_len) {
+    if (name_len == 0) {
+        set_error("empty tool name");
+        return -1;
+    }
+    return 0;
+}
+
+int32_t chitin_load_policies_yaml(void *engine, const char *yaml, size_t yaml_len) {
+    if (yaml_len == 0) {
+        set_error("empty policy");
+        return -1;
+    }
+    return 0;
+}
+
+#ifdef CHITIN_STUB_EX
+int32_t chitin_ingest_batch(void *engine, const char *contents,
+                            const size_t *offsets, size_t count,
+                            const int32_t *trust_levels, const char *metadata,
+                            size_t metadata_len, uint64_t *out_ids) {
+    for (size_t i = 0; i < count; i++) {
+        if (trust_levels[i] > 4) {
+            set_error("invalid trust level");
+            return -1;
+        }
+    }
+    for (size_t i = 0; i < count; i++)
+        out_ids[i] = next_id(engine) + (offsets[i + 1] - offsets[i]) * 10 + trust_levels[i];
+    return 0;
+}
+
+int32_t chitin_propose_ex(void *engine, const char *tool, size_t tool_len,
+                          const char *params, size_t params_len,
+                          const char *agent_id, size_t agent_len,
+                          const uint64_t *sources, size_t sources_len,
+                          uint64_t *out_id, char **out_rule_id,
+                          size_t *out_rule_id_len, char **out_reason,
+                          size_t *out_reason_len) {
+    int32_t st = propose_common(engine, tool, tool_len, agent_len, sources,
+                                sources_len, out_id);
+    if (st == -2 || st == -3) {
+        *out_rule_id = copy_string("r1", out_rule_id_len);
+        *out_reason = copy_string("blocked", out_reason_len);
+    }
+    return st;
+}
+#endif
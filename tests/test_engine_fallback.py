@@ -5,20 +5,26 @@ import os
 import pytest
 
 from chitin import ChitinError, Engine
+from chitin import _ffi
+from chitin._resolve import resolve_chitin_lib
 
 
-def test_engine_raises_when_both_backends_unavailable() -> None:
+def test_engine_raises_when_both_backends_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
     """When lib cannot be loaded and CHITIN_SIDECAR_URL is unset, ChitinError is raised."""
+    # Forget any library an earlier test loaded for this process.
+    monkeypatch.setattr(_ffi, "_CACHED_LIB", None)
     sidecar = os.environ.pop("CHITIN_SIDECAR_URL", None)
     lib_path = os.environ.pop("CHITIN_LIB_PATH", None)
     try:
         # Point at an existing non-library file so resolve returns it but CDLL fails
         fake_lib = os.path.abspath(__file__)
         os.environ["CHITIN_LIB_PATH"] = fake_lib
+        resolve_chitin_lib.cache_clear()
         with pytest.raises(ChitinError) as exc_info:
             Engine()
         assert "CHITIN_SIDECAR_URL" in str(exc_info.value)
     finally:
+        resolve_chitin_lib.cache_clear()
         if sidecar is not None:
             os.environ["CHITIN_SIDECAR_URL"] = sidecar
         if lib_path is not None:
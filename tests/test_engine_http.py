@@ -25,3 +25,35 @@ def test_engine_http_ingest_propose_record() -> None:
         if decision.allowed:
             event_id2 = engine.record_result(decision.event_id, "ok", exit_code=0)
             assert isinstance(event_id2, int)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CHITIN_SIDECAR_URL"),
+    reason="CHITIN_SIDECAR_URL not set",
+)
+def test_engine_http_ingest_batch() -> None:
+    """ingest_batch returns one event_id per event, in order."""
+    with Engine() as engine:
+        event_ids = engine.ingest_batch(
+            [
+                ("first", TrustLevel.USER, None),
+                ("second", TrustLevel.EXTERNAL, {"source": "web"}),
+            ]
+        )
+        assert len(event_ids) == 2
+        assert all(isinstance(i, int) for i in event_ids)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CHITIN_SIDECAR_URL"),
+    reason="CHITIN_SIDECAR_URL not set",
+)
+def test_engine_http_is_traced_many() -> None:
+    """is_traced_many matches is_traced per event."""
+    with Engine() as engine:
+        event_ids = [
+            engine.ingest("a", trust_level=TrustLevel.USER),
+            engine.ingest("b", trust_level=TrustLevel.EXTERNAL),
+        ]
+        traced = engine.is_traced_many(event_ids, "external")
+        assert traced == [engine.is_traced(i, "external") for i in event_ids]
@@ -0,0 +1,50 @@
+"""Tests for Engine method dispatch (HTTP backend, no sidecar contacted)."""
+
+from unittest import mock
+
+import pytest
+
+from chitin import ChitinError, Decision, Engine
+from chitin import _ffi
+
+
+@pytest.fixture
+def http_engine_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make Engine() skip the native library and pick an unreachable sidecar."""
+
+    def no_lib() -> None:
+        raise OSError("no library")
+
+    monkeypatch.setattr(_ffi, "load_ffi", no_lib)
+    monkeypatch.setenv("CHITIN_SIDECAR_URL", "http://127.0.0.1:1")
+
+
+def test_engine_subclass_override_is_called(http_engine_env: None) -> None:
+    """Public methods stay class methods, so subclasses can override them."""
+    allow = Decision(True, "allow", 1, None, None)
+
+    class Recording(Engine):
+        def propose(self, tool, params, agent_id=None, input_sources=None):  # type: ignore[no-untyped-def]
+            return allow
+
+    with Recording() as engine:
+        assert engine.propose("noop", "{}") is allow
+
+
+def test_engine_methods_can_be_patched(http_engine_env: None) -> None:
+    """mock.patch.object on the class replaces the method for existing engines."""
+    with Engine() as engine:
+        with mock.patch.object(Engine, "ingest", return_value=42) as ingest:
+            assert engine.ingest("hi", 1) == 42
+        ingest.assert_called_once_with("hi", 1)
+
+
+def test_engine_closed_methods_raise(http_engine_env: None) -> None:
+    """Every backend method raises 'Engine is closed' after close()."""
+    engine = Engine()
+    engine.close()
+    with pytest.raises(ChitinError) as exc_info:
+        engine.propose("noop", "{}")
+    assert str(exc_info.value) == "[-1] Engine is closed"
+    with pytest.raises(ChitinError):
+        engine.is_traced(1, "external")
@@ -0,0 +1,197 @@
+"""Parity tests for the ctypes and Cython FFI wrappers against a stub library."""
+
+import ctypes
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Any, Callable
+
+import pytest
+
+from chitin import ChitinError, Decision, ExplainResult
+from chitin._ffi import IS_TRACED_SIGNATURE, _ChitinFFI, _setup_signatures, _tool_config
+
+_STUB_SOURCE = os.path.join(os.path.dirname(__file__), "chitin_stub.c")
+_CC = os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+
+
+@pytest.fixture(scope="module", params=["ex", "base"])
+def stub_lib(request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory) -> Any:
+    """The stub library with ("ex") and without ("base") the optional symbols."""
+    if _CC is None or sys.platform == "win32":
+        pytest.skip("no C compiler available")
+    path = str(tmp_path_factory.mktemp("stub") / f"libchitin_{request.param}.so")
+    cmd = [_CC, "-shared", "-fPIC", "-O1", "-o", path, _STUB_SOURCE]
+    if request.param == "ex":
+        cmd.insert(1, "-DCHITIN_STUB_EX")
+    subprocess.run(cmd, check=True)
+    lib = ctypes.CDLL(path)
+    _setup_signatures(lib)
+    assert hasattr(lib, "chitin_propose_ex") == (request.param == "ex")
+    return lib
+
+
+def _call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Result of fn, or (status, message) if it raised ChitinError."""
+    try:
+        return fn(*args, **kwargs)
+    except ChitinError as e:
+        return ("error", e.status, e.message)
+
+
+def _run(ffi: Any) -> dict[str, Any]:
+    """Drive one wrapper through the whole C ABI and collect every result by name."""
+    results: dict[str, Any] = {"engine_new_missing": _call(ffi.engine_new, "missing")}
+    engine = ffi.engine_new(None)
+    try:
+        results["ingest"] = ffi.ingest(engine, "hello", 1)
+        results["ingest_bytes_meta"] = ffi.ingest(engine, b"raw bytes", 2, {"source": "web"})
+        results["ingest_bad_trust"] = _call(ffi.ingest, engine, "x", 9)
+        results["ingest_batch_empty"] = ffi.ingest_batch(engine, [])
+        results["ingest_batch"] = ffi.ingest_batch(
+            engine, [("a", 1, None), (b"bb", 2, None), ("ccc", 3, None)]
+        )
+        results["ingest_batch_meta"] = ffi.ingest_batch(
+            engine, [("a", 1, {"k": 1}), ("bb", 4, None)]
+        )
+        results["ingest_batch_bad_trust"] = _call(
+            ffi.ingest_batch, engine, [("a", 1, None), ("b", 7, None)]
+        )
+        for n in (0, 1, 3, 10, 40):
+            sources = list(range(1, n + 1)) or None
+            results[f"allow_{n}"] = ffi.propose(engine, "noop", "{}", None, sources)
+            results[f"allow_agent_{n}"] = ffi.propose(engine, "noop", b"{}", "agent-1", sources)
+            # deny right after an allow: event_id must not leak from the allow.
+            results[f"deny_{n}"] = ffi.propose(engine, "deny", "{}", None, sources)
+            results[f"escalate_{n}"] = ffi.propose(engine, "escalate", "{}", "agent-1", sources)
+        results["propose_error"] = _call(ffi.propose, engine, "boom", "{}")
+        results["record_result"] = ffi.record_result(engine, 5, "done", 3)
+        results["record_result_missing"] = _call(ffi.record_result, engine, 0, "done")
+        results["is_traced_odd"] = ffi.is_traced(engine, 3, "external")
+        results["is_traced_even"] = ffi.is_traced(engine, 4, "external")
+        results["is_traced_missing"] = _call(ffi.is_traced, engine, 0, "external")
+        results["is_traced_many_empty"] = ffi.is_traced_many(engine, [], "user")
+        results["is_traced_many"] = ffi.is_traced_many(engine, [1, 2, 3, 4], "user")
+        results["is_traced_many_missing"] = _call(ffi.is_traced_many, engine, [1, 0], "user")
+        results["set_label"] = ffi.set_label(engine, 3, "external")
+        results["set_label_missing"] = _call(ffi.set_label, engine, 0, "external")
+        results["explain_empty"] = ffi.explain(engine, 1)
+        results["explain_not_json"] = ffi.explain(engine, 2)
+        results["explain"] = ffi.explain(engine, 7)
+        results["explain_missing"] = _call(ffi.explain, engine, 0)
+        results["load_policies_yaml"] = ffi.load_policies_yaml(engine, "rules: []")
+        results["load_policies_yaml_empty"] = _call(ffi.load_policies_yaml, engine, "")
+        results["register_tool"] = ffi.register_tool(engine, "noop")
+        results["register_tool_category"] = ffi.register_tool(engine, "shell", "high", "exec")
+        results["register_tool_empty"] = _call(ffi.register_tool, engine, "")
+    finally:
+        ffi.engine_free(engine)
+    return results
+
+
+def test_ctypes_wrapper(stub_lib: Any) -> None:
+    """The ctypes wrapper maps the C ABI onto the Python API."""
+    results = _run(_ChitinFFI(stub_lib))
+    assert results["engine_new_missing"] == ("error", -4, "config not found")
+    assert results["ingest"] == 1 * 1000000 + 5 * 10 + 1
+    assert results["ingest_bad_trust"] == ("error", -1, "invalid trust level")
+    assert results["ingest_batch_empty"] == []
+    assert len(results["ingest_batch"]) == 3
+    assert results["ingest_batch_bad_trust"] == ("error", -1, "invalid trust level")
+    for n in (0, 1, 3, 10, 40):
+        allow = results[f"allow_{n}"]
+        assert allow == Decision(True, "allow", allow.event_id, None, None)
+        assert allow.event_id % 1000000 == n * 1000 + sum(range(1, n + 1)) % 1000
+        assert results[f"allow_agent_{n}"].event_id % 1000000 // 100000 == 7
+        assert results[f"deny_{n}"] == Decision(False, "deny", 0, "r1", "blocked")
+        assert results[f"escalate_{n}"] == Decision(False, "escalate", 0, "r1", "blocked")
+    assert results["propose_error"] == ("error", -4, "engine failure")
+    assert results["record_result_missing"] == ("error", -5, "tool call not found")
+    assert results["is_traced_odd"] is True
+    assert results["is_traced_even"] is False
+    assert results["is_traced_many"] == [True, False, True, False]
+    assert results["is_traced_many_missing"] == ("error", -5, "event not found")
+    assert results["explain_empty"] == ExplainResult(text="", trace_chain=[])
+    assert results["explain_not_json"] == ExplainResult(text="not json", trace_chain=[])
+    assert results["explain"] == ExplainResult(text="event 7", trace_chain=[7])
+    assert results["explain_missing"] == ("error", -5, "event not found")
+    assert results["load_policies_yaml_empty"] == ("error", -1, "empty policy")
+    assert results["register_tool_empty"] == ("error", -1, "empty tool name")
+
+
+def test_cython_wrapper_matches_ctypes(stub_lib: Any) -> None:
+    """CyFFI returns exactly what _ChitinFFI returns for the same calls."""
+    cyffi = pytest.importorskip("chitin._cyffi")
+    assert _run(cyffi.CyFFI(stub_lib)) == _run(_ChitinFFI(stub_lib))
+
+
+def test_ctypes_wrapper_shared_across_threads(stub_lib: Any) -> None:
+    """Threads proposing on one _ChitinFFI never see each other's out-params."""
+    ffi = _ChitinFFI(stub_lib)
+    engine = ffi.engine_new(None)
+    errors: list[BaseException] = []
+    barrier = threading.Barrier(4)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        try:
+            for _ in range(500):
+                allow = ffi.propose(engine, "noop", "{}", None, [n])
+                assert allow.allowed and allow.event_id % 1000000 == 1000 + n
+                deny = ffi.propose(engine, "deny", "{}", None, [n])
+                assert deny == Decision(False, "deny", 0, "r1", "blocked")
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 5)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        ffi.engine_free(engine)
+    assert errors == []
+
+
+def test_is_traced_raw_capsule(stub_lib: Any) -> None:
+    """The capsule carries chitin_is_traced and the engine without touching pythonapi."""
+    ffi = _ChitinFFI(stub_lib)
+    engine = ffi.engine_new(None)
+    try:
+        capsule = ffi.is_traced_raw_capsule(engine)
+        get_pointer = ctypes.PYFUNCTYPE(ctypes.c_void_p, ctypes.py_object, ctypes.c_char_p)(
+            ("PyCapsule_GetPointer", ctypes.pythonapi)
+        )
+        get_context = ctypes.PYFUNCTYPE(ctypes.c_void_p, ctypes.py_object)(
+            ("PyCapsule_GetContext", ctypes.pythonapi)
+        )
+        assert get_pointer(capsule, IS_TRACED_SIGNATURE) == ctypes.cast(
+            stub_lib.chitin_is_traced, ctypes.c_void_p
+        ).value
+        assert get_context(capsule) == engine
+        assert ctypes.pythonapi.PyCapsule_New.argtypes is None
+    finally:
+        ffi.engine_free(engine)
+
+
+@pytest.mark.parametrize(
+    ("risk", "category"),
+    [
+        ("medium", None),
+        ("high", "exec"),
+        ('quo"te', "back\\slash"),
+        ("risk\n\t", 'both "\\'),
+        ("élevé", "カテゴリ"),
+        ("emoji \U0001f512", None),
+    ],
+)
+def test_tool_config_matches_json_dumps(risk: str, category: str | None) -> None:
+    """_tool_config encodes the same object json.dumps did for register_tool."""
+    expected: dict[str, str] = {"risk": risk}
+    if category is not None:
+        expected["category"] = category
+    assert json.loads(_tool_config(risk, category)) == expected
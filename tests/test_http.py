@@ -0,0 +1,181 @@
+"""Tests for the sidecar HTTP client against a local stdlib server."""
+
+import gc
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from chitin import ChitinError
+from chitin._http import _ChitinHTTP
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _reply(self, status: int, body: bytes = b"", close: bool = False) -> None:
+        self.send_response(status)
+        if close:
+            self.send_header("Connection", "close")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:  # type: ignore[attr-defined]
+            server.peers.add(self.client_address)  # type: ignore[attr-defined]
+            server.paths.append(self.path)  # type: ignore[attr-defined]
+        if self.path == "/ingest_batch":
+            if server.has_batch:  # type: ignore[attr-defined]
+                ids = [len(e["content"]) for e in req["events"]]
+                self._reply(200, json.dumps({"event_ids": ids}).encode())
+            else:
+                self._reply(404, b"not found")
+        elif self.path == "/register_tool":
+            self._reply(204)
+        elif self.path == "/set_label":
+            self._reply(400, b'{"status": -5, "error": "event not found"}')
+        elif self.path == "/explain":
+            self._reply(502, b"bad gateway")
+        elif self.path == "/load_policies_yaml":
+            # Reply normally, then drop the socket without announcing it.
+            self._reply(200, b"{}")
+            self.close_connection = True
+        elif req.get("trust") == 4:
+            self._reply(200, json.dumps({"event_id": 7}).encode(), close=True)
+        else:
+            self._reply(200, json.dumps({"event_id": len(req["content"])}).encode())
+
+
+@pytest.fixture
+def server() -> Iterator[ThreadingHTTPServer]:
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    srv.peers = set()  # type: ignore[attr-defined]
+    srv.lock = threading.Lock()  # type: ignore[attr-defined]
+    srv.paths = []  # type: ignore[attr-defined]
+    srv.has_batch = False  # type: ignore[attr-defined]
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+@pytest.fixture
+def client(server: ThreadingHTTPServer) -> Iterator[_ChitinHTTP]:
+    http = _ChitinHTTP(f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        yield http
+    finally:
+        http.close()
+
+
+def test_http_reuses_connection(server: ThreadingHTTPServer, client: _ChitinHTTP) -> None:
+    """Sequential calls from one thread share a single keep-alive connection."""
+    for i in range(5):
+        assert client.ingest("x" * i, trust_level=1) == i
+    assert len(server.peers) == 1  # type: ignore[attr-defined]
+
+
+def test_http_reconnects_once_after_server_drop(
+    server: ThreadingHTTPServer, client: _ChitinHTTP
+) -> None:
+    """A connection the server closed silently is replaced on the next call."""
+    client.load_policies_yaml("rules: []")
+    assert client.ingest("abc", trust_level=1) == 3
+    assert len(server.peers) == 2  # type: ignore[attr-defined]
+    assert client.ingest("abcd", trust_level=1) == 4
+    assert len(server.peers) == 2  # type: ignore[attr-defined]
+
+
+def test_http_honours_connection_close(
+    server: ThreadingHTTPServer, client: _ChitinHTTP
+) -> None:
+    """A response with Connection: close drops the connection before the next call."""
+    assert client.ingest("a", trust_level=4) == 7
+    assert client.ingest("ab", trust_level=1) == 2
+    assert len(server.peers) == 2  # type: ignore[attr-defined]
+
+
+def test_http_status_handling(client: _ChitinHTTP) -> None:
+    """204 yields no body; 4xx/5xx map onto ChitinError."""
+    client.register_tool("noop")
+    with pytest.raises(ChitinError) as exc_info:
+        client.set_label(1, "external")
+    assert exc_info.value.status == -5
+    assert exc_info.value.message == "event not found"
+    with pytest.raises(ChitinError) as exc_info:
+        client.explain(1)
+    assert exc_info.value.status == -4
+    assert exc_info.value.message == "HTTP Error 502: Bad Gateway"
+
+
+def test_http_ingest_batch(server: ThreadingHTTPServer, client: _ChitinHTTP) -> None:
+    """ingest_batch posts one request when the sidecar serves /ingest_batch."""
+    server.has_batch = True  # type: ignore[attr-defined]
+    assert client.ingest_batch([("a", 1, None), (b"bcd", 2, {"k": 1})]) == [1, 3]
+    assert server.paths == ["/ingest_batch"]  # type: ignore[attr-defined]
+
+
+def test_http_ingest_batch_falls_back_on_404(
+    server: ThreadingHTTPServer, client: _ChitinHTTP
+) -> None:
+    """Without /ingest_batch, events are ingested one by one and the 404 is remembered."""
+    assert client.ingest_batch([("a", 1, None), ("bc", 2, None)]) == [1, 2]
+    assert client.ingest_batch([("xyz", 1, None)]) == [3]
+    assert server.paths == [  # type: ignore[attr-defined]
+        "/ingest_batch",
+        "/ingest",
+        "/ingest",
+        "/ingest",
+    ]
+
+
+def test_http_concurrent_calls(server: ThreadingHTTPServer, client: _ChitinHTTP) -> None:
+    """Threads sharing one client each get their own connection and never fail."""
+    errors: list[BaseException] = []
+    barrier = threading.Barrier(8)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        try:
+            for _ in range(50):
+                assert client.ingest("y" * n, trust_level=1) == n
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(server.peers) == 8  # type: ignore[attr-defined]
+
+
+def test_http_closes_connection_when_thread_exits(client: _ChitinHTTP) -> None:
+    """Short-lived threads do not leave their connections open behind them."""
+    conns = []
+
+    def worker() -> None:
+        client.ingest("a", trust_level=1)
+        conns.append(client._local.slot.conn)
+
+    for _ in range(5):
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+    gc.collect()
+    assert len(conns) == 5
+    assert all(conn.sock is None for conn in conns)
+    assert len(client._slots) == 0
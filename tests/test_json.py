@@ -0,0 +1,78 @@
+"""Tests for the JSON codec under each optional-dependency combination."""
+
+import importlib
+import sys
+from collections.abc import Iterator
+from types import ModuleType
+
+import pytest
+
+import chitin._json
+from chitin import Decision
+from chitin import _http
+
+
+@pytest.fixture(params=["orjson", "msgspec", "stdlib"])
+def codec(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[ModuleType]:
+    """chitin._json reloaded with only the named backend importable."""
+    if request.param in ("orjson", "msgspec"):
+        pytest.importorskip(request.param)
+    if request.param != "orjson":
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    if request.param == "stdlib":
+        monkeypatch.setitem(sys.modules, "msgspec", None)
+    module = importlib.reload(chitin._json)
+    assert (module.orjson is None) == (request.param != "orjson")
+    assert (module.msgspec is None) == (request.param == "stdlib")
+    monkeypatch.setattr(_http, "loads", module.loads)
+    monkeypatch.setattr(_http, "decode_propose", module.decode_propose)
+    try:
+        yield module
+    finally:
+        monkeypatch.undo()
+        importlib.reload(chitin._json)
+
+
+def test_dumps_returns_bytes(codec: ModuleType) -> None:
+    """dumps always yields bytes that loads reads back."""
+    data = codec.dumps({"content": "héllo", "trust": 1, "meta": [None, True]})
+    assert isinstance(data, bytes)
+    assert codec.loads(data) == {"content": "héllo", "trust": 1, "meta": [None, True]}
+
+
+def test_dumps_int_keys(codec: ModuleType) -> None:
+    """Non-string keys are written as strings, like json.dumps."""
+    assert codec.loads(codec.dumps({1: "a", "b": {2: 3}})) == {"1": "a", "b": {"2": 3}}
+
+
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [
+        (
+            b'{"event_id": 3, "allowed": true, "outcome": "allow"}',
+            Decision(True, "allow", 3, None, None),
+        ),
+        (
+            b'{"event_id": 4, "outcome": "deny", "rule_id": "r1", "reason": "no"}',
+            Decision(False, "deny", 4, "r1", "no"),
+        ),
+        (b'{"event_id": "5", "allowed": 1}', Decision(True, "deny", 5, None, None)),
+        (
+            b'{"event_id": 6, "allowed": 0, "outcome": "escalate"}',
+            Decision(False, "escalate", 6, None, None),
+        ),
+    ],
+)
+def test_http_propose_decoding(
+    codec: ModuleType,
+    monkeypatch: pytest.MonkeyPatch,
+    body: bytes,
+    expected: Decision,
+) -> None:
+    """/propose bodies that do not fit the typed schema still decode via a dict."""
+    client = _http._ChitinHTTP("http://127.0.0.1:1")
+    monkeypatch.setattr(client, "_post_raw", lambda path, req: body)
+    decision = client.propose("noop", "{}")
+    assert decision == expected
+    assert type(decision.event_id) is int
+    assert type(decision.allowed) is bool
@@ -0,0 +1,38 @@
+"""Tests for shared library path resolution."""
+
+import os
+
+from chitin._resolve import resolve_chitin_lib
+
+
+def test_resolve_uses_chitin_lib_path_and_caches() -> None:
+    """CHITIN_LIB_PATH wins and the result is reused for the rest of the process."""
+    lib_path = os.environ.pop("CHITIN_LIB_PATH", None)
+    try:
+        os.environ["CHITIN_LIB_PATH"] = __file__
+        resolve_chitin_lib.cache_clear()
+        assert resolve_chitin_lib() == os.path.abspath(__file__)
+
+        os.environ["CHITIN_LIB_PATH"] = os.path.dirname(__file__)
+        assert resolve_chitin_lib() == os.path.abspath(__file__)
+    finally:
+        resolve_chitin_lib.cache_clear()
+        if lib_path is not None:
+            os.environ["CHITIN_LIB_PATH"] = lib_path
+        else:
+            os.environ.pop("CHITIN_LIB_PATH", None)
+
+
+def test_resolve_skips_chitin_lib_path_that_is_not_a_file() -> None:
+    """A directory in CHITIN_LIB_PATH is not returned as the library."""
+    lib_path = os.environ.pop("CHITIN_LIB_PATH", None)
+    try:
+        os.environ["CHITIN_LIB_PATH"] = os.path.dirname(__file__)
+        resolve_chitin_lib.cache_clear()
+        assert resolve_chitin_lib() != os.path.abspath(os.path.dirname(__file__))
+    finally:
+        resolve_chitin_lib.cache_clear()
+        if lib_path is not None:
+            os.environ["CHITIN_LIB_PATH"] = lib_path
+        else:
+            os.environ.pop("CHITIN_LIB_PATH", None)
@@ -1,5 +1,7 @@
 """Tests for public types."""
 
+import pickle
+
 import pytest
 
 from chitin import ChitinError, Decision, ExplainResult, TrustLevel
@@ -24,12 +26,14 @@ def test_decision_dataclass() -> None:
     assert d.allowed is True
     assert d.outcome == "allow"
     assert d.event_id == 1
+    assert not hasattr(d, "__dict__")
 
 
 def test_explain_result_dataclass() -> None:
     e = ExplainResult(text="foo", trace_chain=[1, 2, 3])
     assert e.text == "foo"
     assert e.trace_chain == [1, 2, 3]
+    assert not hasattr(e, "__dict__")
 
 
 def test_chitin_error() -> None:
@@ -37,3 +41,10 @@ def test_chitin_error() -> None:
     assert err.status == -1
     assert err.message == "invalid"
     assert "[-1]" in str(err)
+
+
+def test_chitin_error_pickles() -> None:
+    err = pickle.loads(pickle.dumps(ChitinError(-2, "denied")))
+    assert err.status == -2
+    assert err.message == "denied"
+    assert str(err) == "[-2] denied"